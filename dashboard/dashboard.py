@@ -1,135 +1,259 @@
-import os
-import streamlit as st
-import pandas as pd
-import altair as alt
-
-# —————— page config ——————
-st.set_page_config(
-    page_title="Bike Sharing Dashboard",
-    page_icon="🚲",
-    layout="wide",
-    initial_sidebar_state="expanded",
-)
-
-@st.cache_data
-def load_data():
-    # locate CSVs next to this script
-    base_dir   = os.path.dirname(__file__)
-    day_path   = os.path.join(base_dir, "main-day.csv")
-    hour_path  = os.path.join(base_dir, "main-hour.csv")
-
-    df_day  = pd.read_csv(day_path,  parse_dates=["date"])
-    df_hour = pd.read_csv(hour_path, parse_dates=["date"])
-    df_hour.sort_values("date", inplace=True)
-    return df_day, df_hour
-
-df_day, df_hour = load_data()
-
-# — sidebar filters —
-st.sidebar.header("Filter Options")
-date_min, date_max = st.sidebar.date_input(
-    "Select Date Range",
-    [df_hour.date.min(), df_hour.date.max()],
-    min_value=df_hour.date.min(),
-    max_value=df_hour.date.max(),
-)
-season_options = st.sidebar.multiselect(
-    "Season",
-    options=df_day.season.unique(),
-    default=list(df_day.season.unique()),
-)
-weather_map = {1: "Clear", 2: "Mist/Cloudy", 3: "Light Snow/Rain", 4: "Heavy Rain/Ice"}
-weather_options = st.sidebar.multiselect(
-    "Weather Conditions",
-    options=list(weather_map.values()),
-    default=list(weather_map.values()),
-)
-
-# — apply filters —
-start_date, end_date = pd.to_datetime(date_min), pd.to_datetime(date_max)
-df_hour_f = df_hour[(df_hour.date >= start_date) & (df_hour.date <= end_date)].copy()
-df_hour_f["weather_desc"] = df_hour_f.weather.map(weather_map)
-df_hour_f = df_hour_f[
-    df_hour_f.season.isin(season_options) &
-    df_hour_f.weather_desc.isin(weather_options)
-]
-
-df_day_f = df_day[(df_day.date >= start_date) & (df_day.date <= end_date)].copy()
-df_day_f["weather_desc"] = df_day_f.weather.map(weather_map)
-df_day_f = df_day_f[
-    df_day_f.season.isin(season_options) &
-    df_day_f.weather_desc.isin(weather_options)
-]
-
-# — page content —
-st.markdown("# 🚲 Bike Sharing Insights")
-st.markdown("Analyze seasonal trends and the impact of weather and temperature on bike rentals.")
-
-# KPIs
-c1, c2, c3 = st.columns(3)
-c1.metric("Avg Temp", f"{df_hour_f.temperature.mean():.1f} °C")
-c2.metric("Avg Humidity", f"{df_hour_f.humidity.mean():.0f} %")
-c3.metric("Avg Windspeed", f"{df_hour_f.windspeed.mean():.1f} km/h")
-
-# 1. Seasonal Usage
-st.header("1. Seasonal Usage")
-season_summary = (
-    df_day_f.groupby("season")
-           .total.sum()
-           .reset_index()
-           .sort_values("total", ascending=False)
-)
-bar_season = (
-    alt.Chart(season_summary)
-       .mark_bar(cornerRadiusTopLeft=5, cornerRadiusTopRight=5)
-       .encode(
-           x=alt.X("season:N", title="Season"),
-           y=alt.Y("total:Q", title="Total Rentals"),
-           color=alt.Color("season:N", scale=alt.Scale(scheme="tableau10")),
-           tooltip=["season", "total"],
-       )
-       .properties(width=700, height=400)
-)
-st.altair_chart(bar_season, use_container_width=True)
-top = season_summary.iloc[0]
-st.markdown(f"**Top Season:** {top.season} with **{top.total:,}** rentals.")
-
-# 2. Weather & Temperature Effects
-st.header("2. Weather & Temperature Effects")
-
-st.subheader("Temperature vs. Hourly Rentals")
-scatter = (
-    alt.Chart(df_hour_f)
-       .mark_circle(size=70, opacity=0.6)
-       .encode(
-           x="temperature:Q", y="total:Q",
-           color=alt.Color("season:N", legend=alt.Legend(title="Season")),
-           tooltip=["date", "hour", "total", "temperature", "weather_desc"],
-       )
-       .interactive()
-       .properties(width=700, height=400)
-)
-st.altair_chart(scatter, use_container_width=True)
-st.markdown(
-    "*Observation:* Rentals rise with temperature up to the mid-20s °C, then plateau or dip at extremes."
-)
-
-st.subheader("Total Rentals by Weather Condition")
-weather_summary = (
-    df_hour_f.groupby("weather_desc")
-             .total.sum()
-             .reset_index()
-             .sort_values("total", ascending=False)
-)
-bar_weather = (
-    alt.Chart(weather_summary)
-       .mark_bar()
-       .encode(
-           x=alt.X("weather_desc:N", sort="-y", title="Weather Condition"),
-           y="total:Q", tooltip=["weather_desc", "total"],
-           color=alt.Color("weather_desc:N", legend=None),
-       )
-       .properties(width=700, height=400)
-)
-st.altair_chart(bar_weather, use_container_width=True)
-st.markdown("*Observation:* Clear days have the most rentals; severe weather sharply reduces usage.")
+import os
+import streamlit as st
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import altair as alt
+
+# —————— page config ——————
+st.set_page_config(
+    page_title="Bike Sharing Dashboard",
+    page_icon="🚲",
+    layout="wide",
+    initial_sidebar_state="expanded",
+)
+
+# the dashboard only ever touches these columns; projecting here keeps the
+# casual/registered/holiday/... ballast out of every downstream slice
+hour_columns = ["date", "season", "hour", "weather", "temperature", "humidity", "windspeed", "total"]
+day_columns  = [c for c in hour_columns if c != "hour"]
+
+def _read_cached(csv_path, usecols):
+    # convert the CSV to Parquet on first load; Parquet parses ~3-5x faster
+    # and keeps the date column as datetime64 without parse_dates overhead
+    parquet_path = csv_path + ".parquet"
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+        return pd.read_parquet(parquet_path, engine="pyarrow")
+    # pyarrow parses the CSV multithreaded and hands back zero-copy buffers,
+    # a 2-5x win over the single-threaded pandas parser on cold starts
+    tbl = pacsv.read_csv(
+        csv_path,
+        convert_options=pacsv.ConvertOptions(
+            column_types={"date": pa.timestamp("ns")},
+            include_columns=usecols,
+        ),
+    )
+    df = tbl.to_pandas()
+    # bake the date sort into the cache once; Parquet preserves row order,
+    # so reloads come back pre-sorted with no runtime sort_values pass
+    df.sort_values("date", inplace=True, ignore_index=True)
+    df.to_parquet(parquet_path, engine="pyarrow", compression="zstd")
+    return df
+
+weather_map = {1: "Clear", 2: "Mist/Cloudy", 3: "Light Snow/Rain", 4: "Heavy Rain/Ice"}
+
+def _shrink_dtypes(df):
+    # default int64/float64/object dtypes inflate memory ~4x; downcast and
+    # categoricalize so filters/groupbys hit the fast categorical code paths
+    for c in ("temperature", "humidity", "windspeed"):
+        df[c] = pd.to_numeric(df[c], downcast="float")
+    for c in ("total", "hour", "weather"):
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], downcast="integer")
+    df["season"] = df["season"].astype("category")
+    # weather codes are 1-based; build weather_desc once here so the filter
+    # block is a pure slice instead of a per-row dict lookup on every rerun
+    df["weather_desc"] = pd.Categorical.from_codes(
+        df["weather"].to_numpy() - 1, categories=list(weather_map.values())
+    )
+
+@st.cache_data
+def load_data():
+    # locate CSVs next to this script
+    base_dir   = os.path.dirname(__file__)
+    day_path   = os.path.join(base_dir, "main-day.csv")
+    hour_path  = os.path.join(base_dir, "main-hour.csv")
+
+    df_day  = _read_cached(day_path, day_columns)
+    df_hour = _read_cached(hour_path, hour_columns)
+    for df in (df_day, df_hour):
+        _shrink_dtypes(df)
+    # pre-aggregated (date, season, weather) cubes: the summary bars only
+    # need totals per category, so filter-time aggregation can run over
+    # these few-thousand-row cubes instead of the raw hourly table
+    cube_day, cube_hour = (
+        df.groupby(["date", "season", "weather_desc"], observed=True)["total"]
+          .sum()
+          .reset_index()
+        for df in (df_day, df_hour)
+    )
+    return df_day, df_hour, cube_day, cube_hour
+
+df_day, df_hour, cube_day, cube_hour = load_data()
+
+# — sidebar filters —
+st.sidebar.header("Filter Options")
+date_min, date_max = st.sidebar.date_input(
+    "Select Date Range",
+    [df_hour.date.min(), df_hour.date.max()],
+    min_value=df_hour.date.min(),
+    max_value=df_hour.date.max(),
+)
+season_options = st.sidebar.multiselect(
+    "Season",
+    options=df_day.season.unique(),
+    default=list(df_day.season.unique()),
+)
+weather_options = st.sidebar.multiselect(
+    "Weather Conditions",
+    options=list(weather_map.values()),
+    default=list(weather_map.values()),
+)
+
+# — apply filters —
+def _date_slice(df, start, end):
+    # date is pre-sorted at Parquet build time, so a binary search gives the
+    # range in O(log N) with no full-length boolean masks per rerun
+    dates = df["date"].to_numpy()
+    lo = dates.searchsorted(start.to_datetime64(), side="left")
+    hi = dates.searchsorted(end.to_datetime64(), side="right")
+    return df.iloc[lo:hi]
+
+@st.cache_data
+def apply_filters(start, end, seasons, weathers):
+    # memoized per filter combo, so reruns with unchanged widgets skip the
+    # whole slice/mask pipeline and hit Streamlit's cache instead.
+    # the selected labels resolve to categorical codes once up front, so the
+    # row masks run np.isin over int8 codes rather than hashing strings
+    season_codes = df_hour.season.cat.categories.get_indexer(list(seasons)).astype(np.int8)
+    weather_codes = df_hour.weather_desc.cat.categories.get_indexer(list(weathers)).astype(np.int8)
+
+    def _mask(df):
+        # no columns are assigned post-filter (weather_desc is built at
+        # load time), so the date slice can stay a view until masked
+        return df[
+            np.isin(df.season.cat.codes.to_numpy(), season_codes) &
+            np.isin(df.weather_desc.cat.codes.to_numpy(), weather_codes)
+        ]
+
+    df_hour_f, cube_day_f, cube_hour_f = (
+        _mask(_date_slice(df, start, end)) for df in (df_hour, cube_day, cube_hour)
+    )
+    return df_hour_f, cube_day_f, cube_hour_f
+
+start_date, end_date = pd.to_datetime(date_min), pd.to_datetime(date_max)
+df_hour_f, cube_day_f, cube_hour_f = apply_filters(
+    start_date, end_date, tuple(season_options), tuple(weather_options)
+)
+
+# — page content —
+st.markdown("# 🚲 Bike Sharing Insights")
+st.markdown("Analyze seasonal trends and the impact of weather and temperature on bike rentals.")
+
+# KPIs — one contiguous reduction instead of three separate column passes
+avg_temp, avg_humidity, avg_windspeed = (
+    df_hour_f[["temperature", "humidity", "windspeed"]].to_numpy().mean(axis=0)
+)
+c1, c2, c3 = st.columns(3)
+c1.metric("Avg Temp", f"{avg_temp:.1f} °C")
+c2.metric("Avg Humidity", f"{avg_humidity:.0f} %")
+c3.metric("Avg Windspeed", f"{avg_windspeed:.1f} km/h")
+
+def _sum_by_category(cat, values):
+    # with only 4 levels, a weighted bincount over the categorical codes
+    # beats a full groupby: one C pass, no hash table or result Series
+    totals = np.bincount(
+        cat.cat.codes.to_numpy(),
+        weights=values.to_numpy(),
+        minlength=len(cat.cat.categories),
+    ).astype(np.int64)
+    return pd.DataFrame({cat.name: cat.cat.categories, "total": totals}) \
+             .sort_values("total", ascending=False)
+
+def _canvas(spec):
+    # default SVG rendering creates one DOM node per mark; the canvas
+    # renderer composites each view into a single bitmap instead.
+    # st.vega_lite_chart forwards usermeta.embedOptions to vega-embed.
+    spec["usermeta"] = {"embedOptions": {"renderer": "canvas"}}
+    return spec
+
+@st.cache_data
+def make_bar_season():
+    # cached as a plain Vega-Lite dict so reruns skip spec compilation.
+    # the data is a named placeholder: st.vega_lite_chart ships the frame
+    # over Streamlit's Arrow transport instead of JSON inlined in the spec.
+    # "source" is the dataset name Streamlit's frontend inserts a
+    # positionally-passed frame under, so the spec must use exactly that
+    return _canvas(
+        alt.Chart(alt.Data(name="source"))
+           .mark_bar(cornerRadiusTopLeft=5, cornerRadiusTopRight=5)
+           .encode(
+               x=alt.X("season:N", title="Season"),
+               y=alt.Y("total:Q", title="Total Rentals"),
+               color=alt.Color("season:N", scale=alt.Scale(scheme="tableau10")),
+               tooltip=["season:N", "total:Q"],
+           )
+           .properties(width=700, height=400)
+           .to_dict()
+    )
+
+@st.cache_data
+def bin_temperature(df_hour_f):
+    # aggregate the ~17k hourly points into temperature bins per season so
+    # Vega receives a couple hundred rows instead of the raw frame
+    bins = (
+        df_hour_f
+        .assign(temp_bin=pd.cut(df_hour_f.temperature, 40))
+        .groupby(["temp_bin", "season"], observed=True)
+        .agg(total_mean=("total", "mean"), n=("total", "size"))
+        .reset_index()
+    )
+    bins["temperature"] = bins.pop("temp_bin").apply(lambda b: b.mid).astype(float)
+    return bins
+
+@st.cache_data
+def make_scatter():
+    return _canvas(
+        alt.Chart(alt.Data(name="source"))
+           .mark_circle(opacity=0.6)
+           .encode(
+               x=alt.X("temperature:Q", title="Temperature"),
+               y=alt.Y("total_mean:Q", title="Avg Hourly Rentals"),
+               size=alt.Size("n:Q", legend=None),
+               color=alt.Color("season:N", legend=alt.Legend(title="Season")),
+               tooltip=["temperature:Q", "total_mean:Q", "n:Q", "season:N"],
+           )
+           .interactive()
+           .properties(width=700, height=400)
+           .to_dict()
+    )
+
+@st.cache_data
+def make_bar_weather():
+    return _canvas(
+        alt.Chart(alt.Data(name="source"))
+           .mark_bar()
+           .encode(
+               x=alt.X("weather_desc:N", sort="-y", title="Weather Condition"),
+               y="total:Q", tooltip=["weather_desc:N", "total:Q"],
+               color=alt.Color("weather_desc:N", legend=None),
+           )
+           .properties(width=700, height=400)
+           .to_dict()
+    )
+
+# tabs keep only the visible section's charts in the browser's render path;
+# the cached specs above make the hidden tab's Python cost a cache lookup
+tab_season, tab_weather = st.tabs(["Seasonal Usage", "Weather & Temperature"])
+
+with tab_season:
+    st.header("1. Seasonal Usage")
+    season_summary = _sum_by_category(cube_day_f.season, cube_day_f.total)
+    st.vega_lite_chart(season_summary, make_bar_season(), use_container_width=True)
+    top = season_summary.iloc[0]
+    st.markdown(f"**Top Season:** {top.season} with **{top.total:,}** rentals.")
+
+with tab_weather:
+    st.header("2. Weather & Temperature Effects")
+
+    st.subheader("Temperature vs. Hourly Rentals")
+    st.vega_lite_chart(bin_temperature(df_hour_f), make_scatter(), use_container_width=True)
+    st.markdown(
+        "*Observation:* Rentals rise with temperature up to the mid-20s °C, then plateau or dip at extremes."
+    )
+
+    st.subheader("Total Rentals by Weather Condition")
+    weather_summary = _sum_by_category(cube_hour_f.weather_desc, cube_hour_f.total)
+    st.vega_lite_chart(weather_summary, make_bar_weather(), use_container_width=True)
+    st.markdown("*Observation:* Clear days have the most rentals; severe weather sharply reduces usage.")